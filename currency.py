@@ -1,19 +1,49 @@
+import asyncio
+import atexit
+import aiohttp
+import gzip
 import requests
-import json
+import orjson
 import os
+import sys
 from datetime import datetime, timedelta
-from colorama import init, Fore, Style
+from colorama import just_fix_windows_console, Fore, Style
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Инициализация colorama для Windows
-init(autoreset=True)
+# Цвета выводим только в терминал; вне терминала ANSI-коды не нужны.
+# На Windows включаем поддержку ANSI в консоли без обёртки над sys.stdout,
+# поэтому каждая цветная строка сама сбрасывает стиль.
+if not sys.stdout.isatty():
+    Fore = type("Fore", (), {name: "" for name in ("GREEN", "RED", "YELLOW", "CYAN", "WHITE", "RESET")})
+    Style = type("Style", (), {"BRIGHT": "", "RESET_ALL": ""})
+elif sys.platform == "win32":
+    just_fix_windows_console()
 
 FAVORITE_CURRENCIES = ["USD", "EUR", "GBP", "RUB"]
-FILE_NAME = "currency_rate.json"
+FILE_NAME = "currency_rate.json.gz"
+# Несжатый файл, в котором данные хранились раньше
+LEGACY_FILE_NAME = "currency_rate.json"
+
+# Общая сессия: повторные запросы к API используют уже открытое keep-alive соединение
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
+
+# Долгоживущие цикл событий и сессия aiohttp: при повторных обновлениях
+# сохраняются keep-alive соединения, TLS-сессии и DNS-кэш
+_ASYNC = {"loop": None, "session": None}
+
+# Формат курса по условию rate >= 1: мелкие курсы выводим с большей точностью
+_RATE_FORMATS = ("{:.6f}".format, "{:,.4f}".format)
+
+# Производные структуры, построенные для последних переданных данных
+_DERIVED = {"data": None, "index": {}, "all_currencies": []}
 
 def get_currency_rate(currency_code: str) -> float:
     URL = f"https://open.er-api.com/v6/latest/{currency_code}"
 
-    response = requests.get(URL)
+    response = _SESSION.get(URL, timeout=5)
     if response.status_code != 200: 
         print(f"Ошибка: {response.status_code}")
         return None
@@ -25,22 +55,136 @@ def save_to_file(data: dict):
     """
     Сохраняет данные о курсах валют в файл.
     
+    JSON сжимается gzip. Данные пишутся во временный файл, который затем
+    атомарно заменяет основной, поэтому при сбое во время записи старый файл остаётся целым.
+    
     Args:
         data: Словарь с данными о курсах валют
     """
+    tmp_name = FILE_NAME + ".tmp"
     try:
-        with open(FILE_NAME, "w", encoding="utf-8") as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
+        with open(tmp_name, "wb") as file:
+            file.write(gzip.compress(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_name, FILE_NAME)
     except Exception as e:
         print(f"Ошибка при сохранении файла: {e}")
 
+async def _fetch(session: aiohttp.ClientSession, currency_code: str, cached: dict = None) -> dict:
+    """
+    Асинхронно получает курсы валют для указанной базовой валюты.
+    
+    Если есть сохранённые данные с ETag/Last-Modified, запрос выполняется условно:
+    при ответе 304 сервер не присылает тело, и возвращаются сохранённые данные.
+    
+    Args:
+        session: Сессия aiohttp
+        currency_code: Код базовой валюты
+        cached: Ранее сохранённые данные для этой валюты
+        
+    Returns:
+        dict: Данные о курсах валют или None в случае ошибки
+    """
+    URL = f"https://open.er-api.com/v6/latest/{currency_code}"
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    async with session.get(URL, headers=headers) as response:
+        if response.status == 304 and cached:
+            return cached
+        if response.status != 200:
+            print(f"Ошибка: {response.status}")
+            return None
+        data = await response.json()
+        # Сохраняем валидаторы кэша для следующего условного запроса
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+            if header in response.headers:
+                data[key] = response.headers[header]
+        return data
+
+
+async def _gather(currency_codes: list, cached_data: dict = None) -> list:
+    """
+    Одновременно запрашивает курсы для указанных базовых валют.
+    
+    Args:
+        currency_codes: Список кодов базовых валют
+        cached_data: Ранее сохранённые данные о курсах валют
+        
+    Returns:
+        list: Результаты запросов (данные, None или исключение) в порядке currency_codes
+    """
+    cached_data = cached_data or {}
+    session = await _ensure_session()
+    return await asyncio.gather(
+        *[_fetch(session, currency, cached_data.get(currency)) for currency in currency_codes],
+        return_exceptions=True,
+    )
+
+
+async def _ensure_session() -> aiohttp.ClientSession:
+    """
+    Возвращает общую сессию aiohttp, создавая её при первом обращении.
+    
+    Returns:
+        aiohttp.ClientSession: Сессия, привязанная к циклу из _get_loop
+    """
+    if _ASYNC["session"] is None or _ASYNC["session"].closed:
+        timeout = aiohttp.ClientTimeout(total=10)
+        # Все запросы идут на один хост: кэшируем его DNS-запись и ограничиваем число соединений
+        connector = aiohttp.TCPConnector(ttl_dns_cache=300, use_dns_cache=True, limit=16, limit_per_host=4)
+        _ASYNC["session"] = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return _ASYNC["session"]
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Возвращает общий цикл событий, создавая его при первом обращении."""
+    if _ASYNC["loop"] is None or _ASYNC["loop"].is_closed():
+        _ASYNC["loop"] = asyncio.new_event_loop()
+    return _ASYNC["loop"]
+
+
+@atexit.register
+def _close_async():
+    """Закрывает общую сессию и цикл событий при завершении программы."""
+    loop, session = _ASYNC["loop"], _ASYNC["session"]
+    if loop is None or loop.is_closed():
+        return
+    if session is not None and not session.closed:
+        loop.run_until_complete(session.close())
+    loop.close()
+
+
 def update_currency_rates():
     all_data = {}
-    for currency in FAVORITE_CURRENCIES:
-        rate = get_currency_rate(currency)
-        all_data[currency] = rate
+    cached_data = read_from_file() if os.path.exists(FILE_NAME) else None
+    if not isinstance(cached_data, dict):
+        cached_data = {}
+    
+    # Таблицы API для разных баз не сводятся к кросс-курсам одной из них
+    # (отдельные валюты котируются иначе), поэтому каждая база запрашивается отдельно
+    results = _get_loop().run_until_complete(_gather(FAVORITE_CURRENCIES, cached_data))
+    for currency, result in zip(FAVORITE_CURRENCIES, results):
+        if isinstance(result, Exception):
+            print(f"Ошибка при получении курса {currency}: {result}")
+            result = None
+        all_data[currency] = result
+    
+    # Сервер ответил 304 для всех валют: данные не изменились, достаточно обновить время файла
+    if all(result is not None and result is cached_data.get(currency)
+           for currency, result in all_data.items()):
+        os.utime(FILE_NAME, None)
+        print(f"Данные в {FILE_NAME} актуальны (сервер вернул 304 Not Modified)")
+        return
+    
     save_to_file(all_data)
-    print(f"Данные обновлены в currency_rate.json")
+    print(f"Данные обновлены в {FILE_NAME}")
 
 def read_from_file():
     """
@@ -50,12 +194,12 @@ def read_from_file():
         dict: Данные о курсах валют или None в случае ошибки
     """
     try:
-        with open(FILE_NAME, "r", encoding="utf-8") as file:
-            return json.load(file)
+        with open(FILE_NAME, "rb", buffering=0) as file:
+            return orjson.loads(gzip.decompress(file.read()))
     except FileNotFoundError:
         print(f"Файл {FILE_NAME} не найден.")
         return None
-    except json.JSONDecodeError:
+    except (orjson.JSONDecodeError, gzip.BadGzipFile):
         print(f"Ошибка: Неверный формат JSON в файле {FILE_NAME}.")
         return None
     except Exception as e:
@@ -63,6 +207,30 @@ def read_from_file():
         return None
 
 
+def migrate_legacy_file():
+    """
+    Однократно переносит данные из несжатого LEGACY_FILE_NAME в FILE_NAME.
+    
+    Время модификации переносится вместе с данными, чтобы проверка
+    возраста файла продолжала работать.
+    """
+    if os.path.exists(FILE_NAME) or not os.path.exists(LEGACY_FILE_NAME):
+        return
+    
+    try:
+        with open(LEGACY_FILE_NAME, "rb", buffering=0) as file:
+            data = orjson.loads(file.read())
+        legacy_stat = os.stat(LEGACY_FILE_NAME)
+    except Exception as e:
+        print(f"Ошибка при переносе данных из {LEGACY_FILE_NAME}: {e}")
+        return
+    
+    save_to_file(data)
+    if os.path.exists(FILE_NAME):
+        os.utime(FILE_NAME, (legacy_stat.st_atime, legacy_stat.st_mtime))
+        print(f"Данные перенесены из {LEGACY_FILE_NAME} в {FILE_NAME}")
+
+
 def is_file_older_than_24_hours(file_path: str) -> bool:
     """
     Проверяет, старше ли файл 24 часов.
@@ -99,6 +267,8 @@ def load_or_update_currency_rates():
     Returns:
         dict: Данные о курсах валют
     """
+    migrate_legacy_file()
+    
     # Проверяем, нужно ли обновлять файл
     if is_file_older_than_24_hours(FILE_NAME):
         print(f"Файл {FILE_NAME} не найден или старше 24 часов. Обновление данных...")
@@ -123,6 +293,52 @@ def get_available_base_currencies(data: dict) -> list:
     return list(data.keys())
 
 
+def build_currency_index(data: dict) -> dict:
+    """
+    Строит обратный индекс "валюта -> базовая валюта".
+    
+    Args:
+        data: Словарь с данными о курсах валют
+        
+    Returns:
+        dict: Для каждой валюты - первая базовая валюта, в rates которой она есть
+    """
+    index = {}
+    for base_currency, currency_data in data.items():
+        if isinstance(currency_data, dict) and "rates" in currency_data:
+            for currency in currency_data["rates"]:
+                index.setdefault(currency, base_currency)
+    
+    # Базовые валюты всегда ссылаются сами на себя
+    index.update({base_currency: base_currency for base_currency in data})
+    return index
+
+
+def _get_derived(data: dict) -> dict:
+    """Возвращает производные структуры для data, перестраивая их при смене данных."""
+    if data is not _DERIVED["data"]:
+        _DERIVED["data"] = data
+        _DERIVED["index"] = build_currency_index(data)
+        _DERIVED["all_currencies"] = sorted({currency
+                                             for currency_data in data.values()
+                                             if isinstance(currency_data, dict) and "rates" in currency_data
+                                             for currency in currency_data["rates"]})
+    return _DERIVED
+
+
+def get_all_currencies(data: dict) -> list:
+    """
+    Получает отсортированный список всех валют из rates всех базовых валют.
+    
+    Args:
+        data: Словарь с данными о курсах валют
+        
+    Returns:
+        list: Список кодов валют
+    """
+    return _get_derived(data)["all_currencies"]
+
+
 def find_base_currency_for_currency(data: dict, currency: str) -> str:
     """
     Находит базовую валюту, в rates которой есть указанная валюта.
@@ -134,17 +350,7 @@ def find_base_currency_for_currency(data: dict, currency: str) -> str:
     Returns:
         str: Код базовой валюты или None
     """
-    # Сначала проверяем, является ли валюта базовой
-    if currency in data:
-        return currency
-    
-    # Ищем валюту в rates других базовых валют
-    for base_currency, currency_data in data.items():
-        if isinstance(currency_data, dict) and "rates" in currency_data:
-            if currency in currency_data["rates"]:
-                return base_currency
-    
-    return None
+    return _get_derived(data)["index"].get(currency)
 
 
 def get_rates_for_base_currency(data: dict, base_currency: str) -> dict:
@@ -184,31 +390,38 @@ def get_rates_for_base_currency(data: dict, base_currency: str) -> dict:
     if base_rate == 0:
         return None
     
-    # Вычисляем курсы всех валют относительно новой базовой
-    new_rates = {}
-    for currency, rate in source_rates.items():
-        if currency == base_currency:
-            new_rates[currency] = 1.0
-        else:
-            new_rates[currency] = rate / base_rate
+    # Вычисляем курсы всех валют относительно новой базовой одним проходом
+    new_rates = {currency: rate / base_rate for currency, rate in source_rates.items()}
+    new_rates[base_currency] = 1.0
     
     return new_rates
 
 
-def display_currency_rates(base_currency: str, rates: dict):
+def display_currency_rates(base_currency: str, rates: dict, codes: list = None):
     """
     Отображает курсы валют относительно базовой валюты в красивом формате.
     
     Args:
         base_currency: Код базовой валюты
         rates: Словарь с курсами валют
+        codes: Заранее отсортированный список кодов валют (например, из get_all_currencies)
     """
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}{Style.BRIGHT}{f'КУРСЫ ВАЛЮТ ОТНОСИТЕЛЬНО {base_currency}':^80}")
-    print(f"{Fore.CYAN}{'='*80}{Fore.RESET}\n")
+    # Цвета связываем с локальными именами один раз, а не в каждой итерации цикла
+    G, Y, C, W, R = Fore.GREEN, Fore.YELLOW, Fore.CYAN, Fore.WHITE, Fore.RESET
+    B, RA = Style.BRIGHT, Style.RESET_ALL
     
-    # Сортируем валюты по коду
-    sorted_currencies = sorted(rates.items(), key=lambda x: x[0])
+    # Собираем весь блок в список и выводим одним вызовом write
+    buf = [
+        f"\n{C}{'='*80}\n",
+        f"{C}{B}{f'КУРСЫ ВАЛЮТ ОТНОСИТЕЛЬНО {base_currency}':^80}{RA}\n",
+        f"{C}{'='*80}{R}\n\n",
+    ]
+    append = buf.append
+    
+    # Валюты по коду: используем готовый отсортированный список, если он передан
+    if codes is None:
+        codes = sorted(rates)
+    sorted_currencies = [(code, rates[code]) for code in codes if code in rates]
     
     # Выводим курсы в колонках
     currencies_per_line = 4
@@ -217,17 +430,15 @@ def display_currency_rates(base_currency: str, rates: dict):
         line_parts = []
         for currency, rate in line_currencies:
             # Форматируем курс в зависимости от величины
-            if rate >= 1:
-                rate_str = f"{rate:,.4f}".rstrip('0').rstrip('.')
-            else:
-                rate_str = f"{rate:.6f}".rstrip('0').rstrip('.')
+            rate_str = _RATE_FORMATS[rate >= 1](rate).rstrip('0').rstrip('.')
             
-            line_parts.append(f"{Fore.GREEN}{currency}{Fore.RESET}: {Fore.YELLOW}{rate_str}{Fore.RESET}")
+            line_parts.append(f"{G}{currency}{R}: {Y}{rate_str}{R}")
         
-        print(f"  {'  |  '.join(line_parts)}")
+        append(f"  {'  |  '.join(line_parts)}\n")
     
-    print(f"\n{Fore.CYAN}{'='*80}{Fore.RESET}\n")
-    print(f"{Fore.WHITE}Всего валют: {Fore.GREEN}{len(rates)}{Fore.RESET}\n")
+    append(f"\n{C}{'='*80}{R}\n\n")
+    append(f"{W}Всего валют: {G}{len(rates)}{R}\n\n")
+    sys.stdout.write("".join(buf))
 
 
 def show_currency_rates_interface(data: dict):
@@ -237,44 +448,40 @@ def show_currency_rates_interface(data: dict):
     Args:
         data: Словарь с данными о курсах валют
     """
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}{Style.BRIGHT}{'ОТОБРАЖЕНИЕ КУРСОВ ВАЛЮТ':^80}")
+    print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{Style.BRIGHT}{'ОТОБРАЖЕНИЕ КУРСОВ ВАЛЮТ':^80}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*80}{Fore.RESET}\n")
     
     # Получаем список доступных базовых валют
     available_bases = get_available_base_currencies(data)
     
     # Получаем все доступные валюты из rates
-    all_currencies = set()
-    for base, base_data in data.items():
-        if isinstance(base_data, dict) and "rates" in base_data:
-            all_currencies.update(base_data["rates"].keys())
-    
-    all_currencies = sorted(list(all_currencies))
+    all_currencies = get_all_currencies(data)
     
     print(f"{Fore.WHITE}Доступные базовые валюты в файле: {Fore.GREEN}{', '.join(available_bases)}{Fore.RESET}")
     print(f"{Fore.WHITE}Всего доступных валют: {Fore.GREEN}{len(all_currencies)}{Fore.RESET}\n")
     
+    prompt = f"{Fore.YELLOW}Введите код базовой валюты (или 'exit' для выхода): {Fore.RESET}"
     while True:
-        base_currency = input(f"{Fore.YELLOW}Введите код базовой валюты (или 'exit' для выхода): {Fore.RESET}").strip().upper()
+        base_currency = input(prompt).strip().upper()
         
         if base_currency.lower() in ['exit', 'выход', 'quit', 'q']:
             print(f"\n{Fore.YELLOW}Выход из режима просмотра курсов.{Fore.RESET}\n")
             break
         
         if not base_currency:
-            print(f"{Fore.RED}Ошибка: Введите код валюты!\n")
+            print(f"{Fore.RED}Ошибка: Введите код валюты!{Style.RESET_ALL}\n")
             continue
         
         # Получаем курсы для выбранной базовой валюты
         rates = get_rates_for_base_currency(data, base_currency)
         
         if rates is None:
-            print(f"{Fore.RED}Ошибка: Валюта '{base_currency}' не найдена в данных!\n")
+            print(f"{Fore.RED}Ошибка: Валюта '{base_currency}' не найдена в данных!{Style.RESET_ALL}\n")
             continue
         
         # Отображаем курсы
-        display_currency_rates(base_currency, rates)
+        display_currency_rates(base_currency, rates, all_currencies)
 
 
 if __name__ == "__main__":
@@ -1,30 +1,102 @@
-import json
-from colorama import init, Fore, Style
+import functools
+import gzip
+import orjson
+import os
+import sys
+import time
+from colorama import just_fix_windows_console, Fore, Style
 from typing import Dict, Optional
 
-# Инициализация colorama для Windows
-init(autoreset=True)
+# Цвета выводим только в терминал; вне терминала ANSI-коды не нужны.
+# На Windows включаем поддержку ANSI в консоли без обёртки над sys.stdout,
+# поэтому каждая цветная строка сама сбрасывает стиль.
+if not sys.stdout.isatty():
+    Fore = type("Fore", (), {name: "" for name in ("GREEN", "RED", "YELLOW", "CYAN", "WHITE", "RESET")})
+    Style = type("Style", (), {"BRIGHT": "", "RESET_ALL": ""})
+elif sys.platform == "win32":
+    just_fix_windows_console()
+
+FILE_NAME = "currency_rate.json.gz"
+# Несжатый файл старого формата; читается, пока currency.py не перенёс данные
+LEGACY_FILE_NAME = "currency_rate.json"
+
+# Кэш разобранных данных: повторные вызовы не перечитывают файл, пока он не изменился
+_CACHE = {"data": None, "ts": 0.0, "index": {}, "all_currencies": []}
+_TTL = 3600
+
+
+def build_currency_index(data: Dict) -> Dict[str, str]:
+    """
+    Строит обратный индекс "валюта -> базовая валюта".
+    
+    Args:
+        data: Словарь с данными о курсах валют
+        
+    Returns:
+        dict: Для каждой валюты - первая базовая валюта, в rates которой она есть
+    """
+    index = {}
+    for base_currency, currency_data in data.items():
+        if isinstance(currency_data, dict) and "rates" in currency_data:
+            for currency in currency_data["rates"]:
+                index.setdefault(currency, base_currency)
+    
+    # Базовые валюты всегда ссылаются сами на себя
+    index.update({base_currency: base_currency for base_currency in data})
+    return index
+
+
+def _collect_currencies(data: Dict) -> list:
+    """Собирает отсортированный список всех валют из rates всех базовых валют."""
+    return sorted({currency
+                   for currency_data in data.values()
+                   if isinstance(currency_data, dict) and "rates" in currency_data
+                   for currency in currency_data["rates"]})
+
+
+def _get_index(data: Dict) -> Dict[str, str]:
+    """Возвращает закэшированный индекс для загруженных данных или строит новый."""
+    if data is _CACHE["data"]:
+        return _CACHE["index"]
+    return build_currency_index(data)
 
 
 def load_currency_data() -> Optional[Dict]:
     """
     Загружает данные о курсах валют из файла.
     
+    Повторные вызовы возвращают закэшированные данные, если не истёк _TTL
+    и файл не изменялся после последнего чтения.
+    
     Returns:
         dict: Данные о курсах валют или None в случае ошибки
     """
+    file_name = FILE_NAME if os.path.exists(FILE_NAME) else LEGACY_FILE_NAME
     try:
-        with open("currency_rate.json", "r", encoding="utf-8") as file:
-            return json.load(file)
+        if (_CACHE["data"] is not None
+                and time.time() - _CACHE["ts"] < _TTL
+                and os.path.getmtime(file_name) <= _CACHE["ts"]):
+            return _CACHE["data"]
+        
+        ts = time.time()
+        with open(file_name, "rb", buffering=0) as file:
+            raw = file.read()
+        data = orjson.loads(gzip.decompress(raw) if file_name == FILE_NAME else raw)
+        _CACHE.update(data=data, ts=ts, index=build_currency_index(data),
+                      all_currencies=_collect_currencies(data))
+        _cached_exchange_rate.cache_clear()
+        return data
     except FileNotFoundError:
-        print(f"{Fore.RED}Ошибка: Файл currency_rate.json не найден!")
-        print(f"{Fore.YELLOW}Сначала запустите currency.py для обновления данных.")
+        _CACHE.update(data=None, ts=0.0, index={}, all_currencies=[])
+        _cached_exchange_rate.cache_clear()
+        print(f"{Fore.RED}Ошибка: Файл {FILE_NAME} не найден!{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}Сначала запустите currency.py для обновления данных.{Style.RESET_ALL}")
         return None
-    except json.JSONDecodeError:
-        print(f"{Fore.RED}Ошибка: Неверный формат JSON файла!")
+    except (orjson.JSONDecodeError, gzip.BadGzipFile):
+        print(f"{Fore.RED}Ошибка: Неверный формат JSON файла!{Style.RESET_ALL}")
         return None
     except Exception as e:
-        print(f"{Fore.RED}Ошибка при загрузке данных: {e}")
+        print(f"{Fore.RED}Ошибка при загрузке данных: {e}{Style.RESET_ALL}")
         return None
 
 
@@ -38,14 +110,10 @@ def get_available_currencies(data: Dict) -> list:
     Returns:
         list: Список кодов валют
     """
-    currencies = set()
-    
-    # Проходим по всем базовым валютам и собираем все доступные валюты
-    for base_currency, currency_data in data.items():
-        if isinstance(currency_data, dict) and "rates" in currency_data:
-            currencies.update(currency_data["rates"].keys())
-    
-    return sorted(list(currencies))
+    # Для загруженных данных список уже собран в load_currency_data
+    if data is _CACHE["data"]:
+        return _CACHE["all_currencies"]
+    return _collect_currencies(data)
 
 
 def find_base_currency(data: Dict, currency: str) -> Optional[str]:
@@ -59,17 +127,7 @@ def find_base_currency(data: Dict, currency: str) -> Optional[str]:
     Returns:
         str: Код базовой валюты или None
     """
-    # Сначала проверяем, есть ли эта валюта как базовая
-    if currency in data:
-        return currency
-    
-    # Ищем валюту в rates других базовых валют
-    for base_currency, currency_data in data.items():
-        if isinstance(currency_data, dict) and "rates" in currency_data:
-            if currency in currency_data["rates"]:
-                return base_currency
-    
-    return None
+    return _get_index(data).get(currency)
 
 
 def get_exchange_rate(data: Dict, from_currency: str, to_currency: str) -> Optional[float]:
@@ -88,6 +146,20 @@ def get_exchange_rate(data: Dict, from_currency: str, to_currency: str) -> Optio
     if from_currency == to_currency:
         return 1.0
     
+    # Для загруженных данных результат кэшируется по паре валют
+    if data is _CACHE["data"]:
+        return _cached_exchange_rate(from_currency, to_currency)
+    return _compute_exchange_rate(data, from_currency, to_currency)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_exchange_rate(from_currency: str, to_currency: str) -> Optional[float]:
+    """Курс обмена для данных из _CACHE; кэш сбрасывается при перезагрузке файла."""
+    return _compute_exchange_rate(_CACHE["data"], from_currency, to_currency)
+
+
+def _compute_exchange_rate(data: Dict, from_currency: str, to_currency: str) -> Optional[float]:
+    """Вычисляет курс обмена между двумя разными валютами без кэширования."""
     # Находим базовую валюту для исходной валюты
     base_currency = find_base_currency(data, from_currency)
     if not base_currency:
@@ -141,16 +213,21 @@ def display_currencies(currencies: list, per_line: int = 5):
         currencies: Список кодов валют
         per_line: Количество валют в строке
     """
+    G, R = Fore.GREEN, Fore.RESET
+    lines = []
     for i in range(0, len(currencies), per_line):
         line_currencies = currencies[i:i + per_line]
-        formatted = "  ".join([f"{Fore.GREEN}{curr}{Fore.RESET}" for curr in line_currencies])
-        print(f"  {formatted}")
+        formatted = "  ".join([f"{G}{curr}{R}" for curr in line_currencies])
+        lines.append(f"  {formatted}\n")
+    
+    # Выводим весь список одним вызовом write вместо print на каждую строку
+    sys.stdout.write("".join(lines))
 
 
 def print_header(text: str):
     """Выводит заголовок в красивом формате."""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}{Style.BRIGHT}{text:^80}")
+    print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{Style.BRIGHT}{text:^80}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*80}{Fore.RESET}\n")
 
 
@@ -161,7 +238,7 @@ def main():
     print_header("КОНВЕРТЕР ВАЛЮТ")
     
     # Загружаем данные
-    print(f"{Fore.YELLOW}Загрузка данных о курсах валют...")
+    print(f"{Fore.YELLOW}Загрузка данных о курсах валют...{Style.RESET_ALL}")
     data = load_currency_data()
     
     if not data:
@@ -171,21 +248,21 @@ def main():
     available_currencies = get_available_currencies(data)
     
     if not available_currencies:
-        print(f"{Fore.RED}Ошибка: Не найдено доступных валют!")
+        print(f"{Fore.RED}Ошибка: Не найдено доступных валют!{Style.RESET_ALL}")
         return
     
-    print(f"{Fore.GREEN}✓ Данные успешно загружены!")
+    print(f"{Fore.GREEN}✓ Данные успешно загружены!{Style.RESET_ALL}")
     print(f"{Fore.WHITE}Доступно валют: {Fore.GREEN}{len(available_currencies)}{Fore.RESET}\n")
     
     while True:
-        print(f"{Fore.CYAN}{'='*80}")
-        print(f"{Fore.CYAN}{Style.BRIGHT}{'МЕНЮ':^80}")
+        print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{Style.BRIGHT}{'МЕНЮ':^80}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*80}{Fore.RESET}\n")
         
-        print(f"{Fore.WHITE}1. {Fore.GREEN}Конвертировать валюту")
-        print(f"{Fore.WHITE}2. {Fore.GREEN}Показать курс обмена")
-        print(f"{Fore.WHITE}3. {Fore.GREEN}Список доступных валют")
-        print(f"{Fore.WHITE}0. {Fore.RED}Выход\n")
+        print(f"{Fore.WHITE}1. {Fore.GREEN}Конвертировать валюту{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}2. {Fore.GREEN}Показать курс обмена{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}3. {Fore.GREEN}Список доступных валют{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}0. {Fore.RED}Выход{Style.RESET_ALL}\n")
         
         choice = input(f"{Fore.YELLOW}Выберите действие: {Fore.RESET}").strip()
         
@@ -196,89 +273,89 @@ def main():
         elif choice == "1":
             # Конвертация валюты
             print(f"\n{Fore.CYAN}{'─'*80}{Fore.RESET}")
-            print(f"{Fore.YELLOW}{Style.BRIGHT}КОНВЕРТАЦИЯ ВАЛЮТЫ{Fore.RESET}\n")
+            print(f"{Fore.YELLOW}{Style.BRIGHT}КОНВЕРТАЦИЯ ВАЛЮТЫ{Style.RESET_ALL}\n")
             
             # Выбор исходной валюты
-            print(f"{Fore.WHITE}Доступные валюты:")
+            print(f"{Fore.WHITE}Доступные валюты:{Style.RESET_ALL}")
             display_currencies(available_currencies)
             print()
             
             from_currency = input(f"{Fore.YELLOW}Введите код исходной валюты: {Fore.RESET}").strip().upper()
             
             if from_currency not in available_currencies:
-                print(f"{Fore.RED}Ошибка: Валюта '{from_currency}' не найдена!\n")
+                print(f"{Fore.RED}Ошибка: Валюта '{from_currency}' не найдена!{Style.RESET_ALL}\n")
                 continue
             
             # Выбор целевой валюты
             to_currency = input(f"{Fore.YELLOW}Введите код целевой валюты: {Fore.RESET}").strip().upper()
             
             if to_currency not in available_currencies:
-                print(f"{Fore.RED}Ошибка: Валюта '{to_currency}' не найдена!\n")
+                print(f"{Fore.RED}Ошибка: Валюта '{to_currency}' не найдена!{Style.RESET_ALL}\n")
                 continue
             
             # Ввод суммы
             try:
                 amount = float(input(f"{Fore.YELLOW}Введите сумму для конвертации: {Fore.RESET}").strip())
                 if amount < 0:
-                    print(f"{Fore.RED}Ошибка: Сумма не может быть отрицательной!\n")
+                    print(f"{Fore.RED}Ошибка: Сумма не может быть отрицательной!{Style.RESET_ALL}\n")
                     continue
             except ValueError:
-                print(f"{Fore.RED}Ошибка: Введите корректное число!\n")
+                print(f"{Fore.RED}Ошибка: Введите корректное число!{Style.RESET_ALL}\n")
                 continue
             
             # Выполняем конвертацию
             result = convert_currency(data, amount, from_currency, to_currency)
             
             if result is None:
-                print(f"{Fore.RED}Ошибка: Не удалось получить курс обмена между {from_currency} и {to_currency}!\n")
+                print(f"{Fore.RED}Ошибка: Не удалось получить курс обмена между {from_currency} и {to_currency}!{Style.RESET_ALL}\n")
             else:
-                print(f"\n{Fore.GREEN}{'='*80}")
-                print(f"{Fore.GREEN}{Style.BRIGHT}РЕЗУЛЬТАТ КОНВЕРТАЦИИ{Fore.RESET}")
+                print(f"\n{Fore.GREEN}{'='*80}{Style.RESET_ALL}")
+                print(f"{Fore.GREEN}{Style.BRIGHT}РЕЗУЛЬТАТ КОНВЕРТАЦИИ{Style.RESET_ALL}")
                 print(f"{Fore.GREEN}{'='*80}{Fore.RESET}\n")
                 print(f"{Fore.WHITE}  {amount:,.2f} {Fore.YELLOW}{from_currency}{Fore.RESET} = {Fore.GREEN}{result:,.2f} {Fore.YELLOW}{to_currency}{Fore.RESET}\n")
         
         elif choice == "2":
             # Показать курс обмена
             print(f"\n{Fore.CYAN}{'─'*80}{Fore.RESET}")
-            print(f"{Fore.YELLOW}{Style.BRIGHT}КУРС ОБМЕНА{Fore.RESET}\n")
+            print(f"{Fore.YELLOW}{Style.BRIGHT}КУРС ОБМЕНА{Style.RESET_ALL}\n")
             
-            print(f"{Fore.WHITE}Доступные валюты:")
+            print(f"{Fore.WHITE}Доступные валюты:{Style.RESET_ALL}")
             display_currencies(available_currencies)
             print()
             
             from_currency = input(f"{Fore.YELLOW}Введите код исходной валюты: {Fore.RESET}").strip().upper()
             
             if from_currency not in available_currencies:
-                print(f"{Fore.RED}Ошибка: Валюта '{from_currency}' не найдена!\n")
+                print(f"{Fore.RED}Ошибка: Валюта '{from_currency}' не найдена!{Style.RESET_ALL}\n")
                 continue
             
             to_currency = input(f"{Fore.YELLOW}Введите код целевой валюты: {Fore.RESET}").strip().upper()
             
             if to_currency not in available_currencies:
-                print(f"{Fore.RED}Ошибка: Валюта '{to_currency}' не найдена!\n")
+                print(f"{Fore.RED}Ошибка: Валюта '{to_currency}' не найдена!{Style.RESET_ALL}\n")
                 continue
             
             # Получаем курс
             rate = get_exchange_rate(data, from_currency, to_currency)
             
             if rate is None:
-                print(f"{Fore.RED}Ошибка: Не удалось получить курс обмена между {from_currency} и {to_currency}!\n")
+                print(f"{Fore.RED}Ошибка: Не удалось получить курс обмена между {from_currency} и {to_currency}!{Style.RESET_ALL}\n")
             else:
-                print(f"\n{Fore.GREEN}{'='*80}")
-                print(f"{Fore.GREEN}{Style.BRIGHT}КУРС ОБМЕНА{Fore.RESET}")
+                print(f"\n{Fore.GREEN}{'='*80}{Style.RESET_ALL}")
+                print(f"{Fore.GREEN}{Style.BRIGHT}КУРС ОБМЕНА{Style.RESET_ALL}")
                 print(f"{Fore.GREEN}{'='*80}{Fore.RESET}\n")
                 print(f"{Fore.WHITE}  1 {Fore.YELLOW}{from_currency}{Fore.RESET} = {Fore.GREEN}{rate:.6f} {Fore.YELLOW}{to_currency}{Fore.RESET}\n")
         
         elif choice == "3":
             # Список доступных валют
             print(f"\n{Fore.CYAN}{'─'*80}{Fore.RESET}")
-            print(f"{Fore.YELLOW}{Style.BRIGHT}ДОСТУПНЫЕ ВАЛЮТЫ{Fore.RESET}\n")
+            print(f"{Fore.YELLOW}{Style.BRIGHT}ДОСТУПНЫЕ ВАЛЮТЫ{Style.RESET_ALL}\n")
             print(f"{Fore.WHITE}Всего валют: {Fore.GREEN}{len(available_currencies)}{Fore.RESET}\n")
             display_currencies(available_currencies)
             print()
         
         else:
-            print(f"{Fore.RED}Неверный выбор! Попробуйте снова.\n")
+            print(f"{Fore.RED}Неверный выбор! Попробуйте снова.{Style.RESET_ALL}\n")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,17 @@
 import requests
 import json
+import orjson
 from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Общая сессия: соединения с одним и тем же хостом переиспользуются между запросами
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
+
+# Выводить ли заголовки ответа; отключите при большом количестве запросов подряд
+VERBOSE_HEADERS = True
 
 
 def get_request(url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None) -> None:
@@ -21,17 +32,17 @@ def get_request(url: str, headers: Optional[Dict[str, str]] = None, params: Opti
             print(f"Заголовки: {headers}")
         print(f"{'='*60}\n")
         
-        response = requests.get(url, headers=headers, params=params)
+        response = _SESSION.get(url, headers=headers, params=params, timeout=5)
         
         print(f"Статус код: {response.status_code}")
-        print(f"Заголовки ответа: {dict(response.headers)}")
+        if VERBOSE_HEADERS:
+            print(f"Заголовки ответа: {response.headers}")
         print(f"\nТело ответа:")
         
         # Пытаемся распарсить JSON, если не получается - выводим как текст
         try:
-            json_data = response.json()
-            print(json.dumps(json_data, indent=2, ensure_ascii=False))
-        except json.JSONDecodeError:
+            print(orjson.dumps(orjson.loads(response.content), option=orjson.OPT_INDENT_2).decode())
+        except orjson.JSONDecodeError:
             print(response.text)
             
     except requests.exceptions.RequestException as e:
@@ -60,7 +71,7 @@ def get_random_dog() -> None:
         print("🐕 Случайная собака")
         print(f"{'='*60}\n")
         
-        response = requests.get(url)
+        response = _SESSION.get(url, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -106,19 +117,19 @@ def post_request(url: str, data: Optional[Dict[str, Any]] = None,
         
         # Если передан json_data, используем json параметр, иначе data
         if json_data:
-            response = requests.post(url, json=json_data, headers=headers)
+            response = _SESSION.post(url, json=json_data, headers=headers, timeout=5)
         else:
-            response = requests.post(url, data=data, headers=headers)
+            response = _SESSION.post(url, data=data, headers=headers, timeout=5)
         
         print(f"Статус код: {response.status_code}")
-        print(f"Заголовки ответа: {dict(response.headers)}")
+        if VERBOSE_HEADERS:
+            print(f"Заголовки ответа: {response.headers}")
         print(f"\nТело ответа:")
         
         # Пытаемся распарсить JSON, если не получается - выводим как текст
         try:
-            response_json = response.json()
-            print(json.dumps(response_json, indent=2, ensure_ascii=False))
-        except json.JSONDecodeError:
+            print(orjson.dumps(orjson.loads(response.content), option=orjson.OPT_INDENT_2).decode())
+        except orjson.JSONDecodeError:
             print(response.text)
             
     except requests.exceptions.RequestException as e: